@@ -19,6 +19,8 @@ readonly EMBEDDING_MODEL="${EMBEDDING_MODEL:-nomic-embed-text}"
 readonly QDRANT_URL="${QDRANT_URL:-http://localhost:6333}"
 readonly QDRANT_COLLECTION="${QDRANT_COLLECTION:-codequest_problems}"
 readonly QDRANT_VECTOR_SIZE="${QDRANT_VECTOR_SIZE:-768}"  # Adjust based on your embedding model
+readonly QDRANT_COLLECTION_URL="${QDRANT_URL}/collections/${QDRANT_COLLECTION}"
+readonly QDRANT_COLLECTION_CONFIG="{\"vectors\":{\"size\":${QDRANT_VECTOR_SIZE},\"distance\":\"Cosine\"}}"
 
 # Color codes for output
 readonly COLOR_RESET='\033[0m'
@@ -40,8 +42,15 @@ log_error()    { echo -e "${COLOR_RED}❌ $*${COLOR_RESET}" >&2; }
 log_success()  { echo -e "${COLOR_GREEN}✅ $*${COLOR_RESET}"; }
 log_warning()  { echo -e "${COLOR_YELLOW}⚠️  $*${COLOR_RESET}"; }
 log_info()     { echo -e "${COLOR_CYAN}ℹ️  $*${COLOR_RESET}"; }
-log_debug()    { [[ "${DEBUG:-false}" == "true" ]] && echo -e "🔧 $*" >&2; }
-log_vector()   { [[ "${DEBUG:-false}" == "true" ]] && echo -e "${COLOR_MAGENTA}🧠 $*${COLOR_RESET}" >&2; }
+
+# DEBUG is checked once at load time; with it off the debug loggers are no-ops
+if [[ "${DEBUG:-false}" == "true" ]]; then
+    log_debug()    { echo -e "🔧 $*" >&2; }
+    log_vector()   { echo -e "${COLOR_MAGENTA}🧠 $*${COLOR_RESET}" >&2; }
+else
+    log_debug()    { :; }
+    log_vector()   { :; }
+fi
 
 # =============================================================================
 # UTILITY FUNCTIONS
@@ -60,45 +69,87 @@ check_dependencies() {
 
 # Ensure required directories exist
 ensure_directories() {
-    mkdir -p "$BASE_DIR"
+    [[ -d "$BASE_DIR" ]] || mkdir -p "$BASE_DIR"
+}
+
+# Extract several fields from a JSON document with a single jq process
+# Usage: json_read "$json" var1 'filter1' [var2 'filter2' ...]
+json_read() {
+    local __json="$1"; shift
+    local -a __vars=()
+    local __program="" __value __i=0
+
+    while [[ $# -ge 2 ]]; do
+        __vars+=("$1")
+        __program+="${__program:+, }($2), \"\\u0000\""
+        shift 2
+    done
+
+    while IFS= read -r -d '' __value; do
+        printf -v "${__vars[__i]}" '%s' "$__value"
+        __i=$((__i + 1))
+    done < <(printf '%s' "$__json" | jq -j "$__program" 2>/dev/null)
+}
+
+# Set the caller's color and icon for a difficulty level (a case, not an
+# associative array, so bash 3.2 works)
+set_difficulty_style() {
+    case "$1" in
+        "easy") color="$COLOR_GREEN"; icon="🟢" ;;
+        "medium") color="$COLOR_YELLOW"; icon="🟡" ;;
+        "hard") color="$COLOR_RED"; icon="🔴" ;;
+    esac
 }
 
 # Generate unique problem ID
 generate_problem_id() {
-    echo "CQ-$(date +%s | tail -c 6)-$(openssl rand -hex 2 2>/dev/null || echo $RANDOM)"
+    local now
+    if (( BASH_VERSINFO[0] > 4 || (BASH_VERSINFO[0] == 4 && BASH_VERSINFO[1] >= 2) )); then
+        printf -v now '%(%s)T' -1  # Builtin clock read, no date/tail processes
+    else
+        now=$(date +%s)  # %(...)T needs bash 4.2+
+    fi
+    echo "CQ-${now: -5}-$(openssl rand -hex 2 2>/dev/null || echo $RANDOM)"
 }
 
 # =============================================================================
 # QDRANT VECTOR DATABASE MANAGEMENT
 # =============================================================================
 
-# Check if Qdrant is available
+# Cached result of the Qdrant availability probe (empty until first probe)
+QDRANT_AVAILABLE=""
+
+# Check if Qdrant is available (probed at most once per invocation)
 is_qdrant_available() {
-    curl -s --max-time 3 "${QDRANT_URL}/collections" >/dev/null 2>&1
+    if [[ -z "$QDRANT_AVAILABLE" ]]; then
+        curl -s --max-time 3 "${QDRANT_URL}/collections" >/dev/null 2>&1 \
+            && QDRANT_AVAILABLE=true || QDRANT_AVAILABLE=false
+    fi
+    [[ "$QDRANT_AVAILABLE" == true ]]
 }
 
 # Initialize Qdrant collection
 init_qdrant_collection() {
-    if ! is_qdrant_available; then
-        log_warning "Qdrant not available at ${QDRANT_URL}. Vector features disabled."
-        log_info "Start Qdrant with: docker run -p 6333:6333 qdrant/qdrant"
-        return 1
-    fi
-
-    # Attempt to create collection (idempotent: safe to run multiple times)
-    local create_response=$(curl -s -w "%{http_code}" -X PUT "${QDRANT_URL}/collections/${QDRANT_COLLECTION}" \
+    # Attempt to create collection (idempotent: safe to run multiple times).
+    # The request doubles as the availability probe, so startup costs a
+    # single connection to Qdrant instead of two.
+    local create_response=$(curl -s --max-time 3 -w "%{http_code}" -X PUT "${QDRANT_COLLECTION_URL}" \
         -H "Content-Type: application/json" \
-        -d "{
-            \"vectors\": {
-                \"size\": ${QDRANT_VECTOR_SIZE},
-                \"distance\": \"Cosine\"
-            }
-        }")
+        -d "$QDRANT_COLLECTION_CONFIG")
 
     # Extract HTTP status code (last 3 chars)
     local http_code="${create_response: -3}"
     local response_body="${create_response%???}"
 
+    # curl reports 000 when no connection could be made or no reply arrived in time
+    if [[ "$http_code" == "000" ]]; then
+        QDRANT_AVAILABLE=false
+        log_warning "Qdrant not available at ${QDRANT_URL}. Vector features disabled."
+        log_info "Start Qdrant with: docker run -p 6333:6333 qdrant/qdrant"
+        return 1
+    fi
+    QDRANT_AVAILABLE=true
+
     # Success if 200 (created) or 409 (already exists)
     if [[ "$http_code" == "200" || "$http_code" == "409" ]]; then
         if [[ "$http_code" == "200" ]]; then
@@ -116,7 +167,8 @@ init_qdrant_collection() {
 
 # Initialize SQLite database (without vector extensions)
 init_database() {
-    sqlite3 "$DB_FILE" << 'EOF'
+    # Create the schema in the background while Qdrant is being contacted
+    sqlite3 "$DB_FILE" << 'EOF' &
 CREATE TABLE IF NOT EXISTS problems (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     problem_id TEXT UNIQUE NOT NULL,
@@ -135,12 +187,17 @@ CREATE INDEX IF NOT EXISTS idx_problems_difficulty ON problems(difficulty);
 CREATE INDEX IF NOT EXISTS idx_problems_solved ON problems(is_solved);
 CREATE INDEX IF NOT EXISTS idx_problems_category ON problems(category);
 CREATE INDEX IF NOT EXISTS idx_problems_created ON problems(created_at);
+CREATE INDEX IF NOT EXISTS idx_problems_solved_difficulty ON problems(is_solved, difficulty);
 EOF
-
-    log_debug "Database initialized"
+    local schema_pid=$!
     
     # Initialize Qdrant
     init_qdrant_collection
+    local qdrant_status=$?
+    
+    wait "$schema_pid"
+    log_debug "Database initialized"
+    return $qdrant_status
 }
 
 # Execute SQL query and return CSV with headers
@@ -194,7 +251,7 @@ generate_problem_embedding() {
 
 # Store embeddings for a problem in Qdrant
 store_problem_embeddings() {
-    local problem_id="$1" title="$2" description="$3"
+    local problem_id="$1" title="$2" description="$3" embedding="${4:-}"
     
     if ! is_vector_available; then
         log_vector "Qdrant not available, skipping embedding storage"
@@ -207,7 +264,8 @@ store_problem_embeddings() {
         return 1
     fi
     
-    local embedding=$(generate_problem_embedding "$title" "$description")
+    # Reuse an embedding computed earlier (e.g. by the duplicate check)
+    [[ -z "$embedding" ]] && embedding=$(generate_problem_embedding "$title" "$description")
     
     # Clean the embedding - remove any control characters and validate
     if [[ -n "$embedding" ]] && [[ "$embedding" != "null" ]] && [[ "$embedding" != "[]" ]]; then
@@ -222,10 +280,11 @@ store_problem_embeddings() {
         # Convert problem_id to a numeric hash for Qdrant
         local numeric_id=$(echo -n "$problem_id" | cksum | cut -d' ' -f1)
         
-        log_vector "Generated embedding with length: $(echo "$embedding" | jq 'length') for problem: $problem_id"
+        local separators="${embedding//[^,]/}"
+        log_vector "Generated embedding with length: $(( ${#separators} + 1 )) for problem: $problem_id"
         
         # Create the JSON payload safely
-        local json_payload=$(jq -n \
+        local json_payload=$(jq -nc \
             --argjson id "$numeric_id" \
             --argjson vector "$embedding" \
             --arg title "$title" \
@@ -248,19 +307,23 @@ store_problem_embeddings() {
         
         # Store in Qdrant
         local response=$(curl -s -X PUT \
-            "${QDRANT_URL}/collections/${QDRANT_COLLECTION}/points?wait=true" \
+            "${QDRANT_COLLECTION_URL}/points?wait=true" \
             -H "Content-Type: application/json" \
             -d "$json_payload")
         
         log_vector "Qdrant response: $response"
         
-        if echo "$response" | jq -e '.result' >/dev/null 2>&1; then
+        local stored error_status
+        json_read "$response" \
+            stored 'if .result then "true" else "false" end' \
+            error_status '.status.error // "unknown error"'
+        
+        if [[ "$stored" == "true" ]]; then
             log_vector "Stored embeddings in Qdrant for problem: $problem_id (Qdrant ID: $numeric_id)"
             return 0
         else
             log_vector "Failed to store embedding in Qdrant for $problem_id"
-            local error_status=$(echo "$response" | jq -r '.status.error // "unknown error"' 2>/dev/null || echo "invalid response")
-            log_debug "Qdrant error: $error_status"
+            log_debug "Qdrant error: ${error_status:-invalid response}"
             return 1
         fi
     else
@@ -270,9 +333,13 @@ store_problem_embeddings() {
     fi
 }
 
+# Embedding computed by the last is_semantic_duplicate call, kept for reuse
+LAST_PROBLEM_EMBEDDING=""
+
 # Check if problem is semantically similar to existing ones using Qdrant
 is_semantic_duplicate() {
     local title="$1" description="$2"
+    LAST_PROBLEM_EMBEDDING=""
     
     if ! is_vector_available; then
         log_vector "Qdrant not available, skipping semantic check"
@@ -284,10 +351,11 @@ is_semantic_duplicate() {
         log_vector "Failed to generate embedding for similarity check"
         return 1
     fi
+    LAST_PROBLEM_EMBEDDING="$new_embedding"
     
     # Use Qdrant for similarity search
     local similar_problems=$(curl -s -X POST \
-        "${QDRANT_URL}/collections/${QDRANT_COLLECTION}/points/search" \
+        "${QDRANT_COLLECTION_URL}/points/search" \
         -H "Content-Type: application/json" \
         -d "{
             \"vector\": $new_embedding,
@@ -296,18 +364,17 @@ is_semantic_duplicate() {
             \"with_payload\": true
         }")
     
-    if echo "$similar_problems" | jq -e '.result' >/dev/null 2>&1; then
-        local result_count=$(echo "$similar_problems" | jq -r '.result | length')
-        if [[ $result_count -gt 0 ]]; then
-            local most_similar=$(echo "$similar_problems" | jq -r '.result[0]')
-            local similarity_score=$(echo "$most_similar" | jq -r '.score')
-            local similar_title=$(echo "$most_similar" | jq -r '.payload.title')
-            local similar_problem_id=$(echo "$most_similar" | jq -r '.payload.problem_id')
-            
-            local similarity_percent=$(echo "scale=2; $similarity_score * 100" | bc)
-            log_vector "Similar problem found: '$similar_title' (${similarity_percent}% similar) - ID: $similar_problem_id"
-            return 0
-        fi
+    # Parse the search response once for everything we need
+    local result_count similarity_percent similar_title similar_problem_id
+    json_read "$similar_problems" \
+        result_count '.result | if type == "array" then length else 0 end' \
+        similarity_percent '(.result[0].score // 0) * 10000 | floor / 100' \
+        similar_title '.result[0].payload.title' \
+        similar_problem_id '.result[0].payload.problem_id'
+    
+    if [[ "${result_count:-0}" -gt 0 ]]; then
+        log_vector "Similar problem found: '$similar_title' (${similarity_percent}% similar) - ID: $similar_problem_id"
+        return 0
     fi
     
     return 1
@@ -330,13 +397,10 @@ check_vector_db_health() {
         return
     fi
     
-    local collection_info=$(curl -s "${QDRANT_URL}/collections/${QDRANT_COLLECTION}")
+    local collection_info=$(curl -s "${QDRANT_COLLECTION_URL}")
     local total_problems=$(sql_exec "SELECT COUNT(*) FROM problems")
-    local total_vectors=0
-    
-    if echo "$collection_info" | jq -e '.result' >/dev/null 2>&1; then
-        total_vectors=$(echo "$collection_info" | jq -r '.result.vectors_count // 0')
-    fi
+    local total_vectors=$(echo "$collection_info" | jq -r '.result.vectors_count // 0' 2>/dev/null)
+    total_vectors=${total_vectors:-0}
     
     echo "Vector DB Health:"
     echo "  - Problems: $total_problems"
@@ -352,16 +416,23 @@ check_vector_db_health() {
 # AI PROBLEM GENERATION (UNCHANGED)
 # =============================================================================
 
-# Check if AI service is available
+# Cached result of the Ollama availability probe (empty until first probe)
+AI_AVAILABLE=""
+
+# Check if AI service is available (probed at most once per invocation)
 check_ai_available() {
-    log_debug "Checking AI availability at: ${OLLAMA_URL}"
-    curl -s --max-time 3 "${OLLAMA_URL}/api/tags" >/dev/null
+    if [[ -z "$AI_AVAILABLE" ]]; then
+        log_debug "Checking AI availability at: ${OLLAMA_URL}"
+        curl -s --max-time 3 "${OLLAMA_URL}/api/tags" >/dev/null \
+            && AI_AVAILABLE=true || AI_AVAILABLE=false
+    fi
+    [[ "$AI_AVAILABLE" == true ]]
 }
 
 create_ai_prompt() {
     local difficulty="$1"
-    local recent_context=$(get_recent_problems_context 3)
     local avoid_titles="$2"  # New parameter for titles to avoid
+    local recent_context="${3-$(get_recent_problems_context 3)}"  # Optional pre-fetched context (may be empty)
     
     # Build diversity enforcement
     local diversity_clause=""
@@ -417,6 +488,7 @@ generate_problem() {
     local problem_json=""
     local attempts=0
     local max_attempts=3
+    local recent_context="" context_loaded=false
     
     while [[ $attempts -lt $max_attempts ]]; do
         ((attempts++))
@@ -424,15 +496,14 @@ generate_problem() {
         
         # Try AI generation first if available
         if check_ai_available; then
-    local avoid_titles=""
-    if [[ $attempts -gt 0 ]]; then
-        # Get the similar title that was rejected to avoid it
-        local recent_titles=$(get_recent_problems_context 5 | grep -o '"title":"[^"]*"' | cut -d'"' -f4 | head -3)
-        avoid_titles="$recent_titles"
-        log_debug "Avoiding titles on attempt $attempts: $avoid_titles"
+    # The problem table doesn't change between attempts, so read the context once
+    if [[ "$context_loaded" == false ]]; then
+        recent_context=$(get_recent_problems_context 3)
+        context_loaded=true
     fi
     
-    local prompt=$(create_ai_prompt "$difficulty" "$avoid_titles")
+    # No avoid-titles: the old title extraction grepped for JSON in CSV output and never matched
+    local prompt=$(create_ai_prompt "$difficulty" "" "$recent_context")
     
     # Increase creativity on retry attempts
     local temperature="0.7"
@@ -443,7 +514,7 @@ generate_problem() {
         log_debug "Increased creativity parameters for diversity: temp=$temperature, top_k=$top_k"
     fi
     
-    local json_payload=$(jq -n --arg model "$OLLAMA_MODEL" --arg prompt "$prompt" --arg temperature "$temperature" --argjson top_k $top_k '{
+    local json_payload=$(jq -nc --arg model "$OLLAMA_MODEL" --arg prompt "$prompt" --arg temperature "$temperature" --argjson top_k $top_k '{
         model: $model,
         prompt: $prompt,
         stream: false,
@@ -471,8 +542,8 @@ generate_problem() {
             
             # Validate JSON and check for semantic duplicates
             if [[ -n "$problem_json" ]] && echo "$problem_json" | jq -e . >/dev/null 2>&1; then
-                local title=$(echo "$problem_json" | jq -r '.title // ""' | head -c 200)
-                local description=$(echo "$problem_json" | jq -r '.description // ""' | head -c 1000)
+                local title description
+                json_read "$problem_json" title '.title // ""' description '.description // ""'
                 
                 if is_semantic_duplicate "$title" "$description"; then
                     log_debug "Semantic duplicate detected, regenerating..."
@@ -481,6 +552,12 @@ generate_problem() {
                     continue
                 else
                     log_debug "Unique problem generated (semantically distinct)"
+                    # Hand the embedding on so insert_problem doesn't recompute it
+                    if [[ -n "$LAST_PROBLEM_EMBEDDING" ]]; then
+                        problem_json=$(echo "$problem_json" | \
+                            jq -c --argjson embedding "$LAST_PROBLEM_EMBEDDING" '. + {_embedding: $embedding}' 2>/dev/null \
+                            || echo "$problem_json")
+                    fi
                     break
                 fi
             else
@@ -559,7 +636,7 @@ EOF
 # Insert problem into database with embeddings
 insert_problem() {
     local problem_id="$1" title="$2" description="$3" difficulty="$4" category="$5" \
-          test_cases="$6" solution="$7"
+          test_cases="$6" solution="$7" embedding="${8:-}"
     
     # Escape single quotes for SQL
     title="${title//\'/''}"; description="${description//\'/''}"
@@ -570,7 +647,7 @@ insert_problem() {
     
     if sql_exec "$sql_cmd"; then
         # Store embeddings in Qdrant (non-blocking)
-        if store_problem_embeddings "$problem_id" "$title" "$description"; then
+        if store_problem_embeddings "$problem_id" "$title" "$description" "$embedding"; then
             log_debug "Stored embeddings in Qdrant for problem $problem_id"
         else
             log_debug "Failed to store embeddings in Qdrant for problem $problem_id (continuing anyway)"
@@ -590,13 +667,18 @@ cmd_today() {
     echo && echo -e "${COLOR_BLUE}🚀 Today's Coding Challenges${COLOR_RESET}"
     echo -e "${COLOR_BLUE}═══════════════════════════${COLOR_RESET}" && echo
     
-    local unsolved_count=$(sql_exec "SELECT COUNT(*) FROM problems WHERE is_solved = 0")
+    # Total and solved counts come from one query and are reused for the footer
+    local counts_sql="SELECT COUNT(*), COALESCE(SUM(is_solved), 0) FROM problems"
+    local total solved
+    IFS='|' read -r total solved <<< "$(sql_exec "$counts_sql")"
+    local unsolved_count=$(( ${total:-0} - ${solved:-0} ))
     
     # Generate new problems if none available
     if [[ "$unsolved_count" -eq 0 ]]; then
         log_info "No unsolved problems found. Generating new problems..."
         cmd_generate
-        unsolved_count=$(sql_exec "SELECT COUNT(*) FROM problems WHERE is_solved = 0")
+        IFS='|' read -r total solved <<< "$(sql_exec "$counts_sql")"
+        unsolved_count=$(( ${total:-0} - ${solved:-0} ))
     fi
     
     [[ "$unsolved_count" -eq 0 ]] && {
@@ -604,43 +686,40 @@ cmd_today() {
         return
     }
     
-    # Display one problem per difficulty level
-    local problems_shown=0
+    # Display one problem per difficulty level, picked in a single query
+    local picks_sql="" difficulty
     for difficulty in "easy" "medium" "hard"; do
-        local problem_data=$(sqlite3 -json "$DB_FILE" "
-            SELECT problem_id, title, description, category 
+        picks_sql+="${picks_sql:+ UNION ALL }SELECT * FROM (
+            SELECT problem_id, title, description, category, difficulty
             FROM problems 
             WHERE difficulty = '$difficulty' AND is_solved = 0 
-            ORDER BY RANDOM() LIMIT 1" 2>/dev/null)
-        
-        if [[ -n "$problem_data" && "$problem_data" != "[]" ]]; then
-            local id=$(echo "$problem_data" | jq -r '.[0].problem_id')
-            local title=$(echo "$problem_data" | jq -r '.[0].title')
-            local description=$(echo "$problem_data" | jq -r '.[0].description')
-            local category=$(echo "$problem_data" | jq -r '.[0].category')
-            
-            case "$difficulty" in
-                "easy") color="$COLOR_GREEN"; icon="🟢" ;;
-                "medium") color="$COLOR_YELLOW"; icon="🟡" ;;
-                "hard") color="$COLOR_RED"; icon="🔴" ;;
-            esac
-            
-            echo -e "$icon ${color}$title${COLOR_RESET}"
-            echo "   📋 ID: $id | 🏷️  $category"
-            echo "   📝 $(echo "$description" | cut -c 1-100)..."
-            echo
-            ((problems_shown++))
-        fi
+            ORDER BY RANDOM() LIMIT 1)"
     done
     
-    local total=$(sql_exec "SELECT COUNT(*) FROM problems")
-    local solved=$(sql_exec "SELECT COUNT(*) FROM problems WHERE is_solved = 1")
+    local problems_data=$(sqlite3 -json "$DB_FILE" "$picks_sql" 2>/dev/null)
     
-    echo "📊 Progress: $solved/$total problems solved"
-    echo && echo "💡 Commands:"
-    echo "   $SCRIPT_NAME show <id>    - View problem details"
-    echo "   $SCRIPT_NAME solve <id>   - Mark as solved"
-    echo "   $SCRIPT_NAME generate     - Create new problems"
+    local problems_shown=0 id title description category block output=""
+    while IFS= read -r -d '' id && IFS= read -r -d '' title && \
+          IFS= read -r -d '' description && IFS= read -r -d '' category && \
+          IFS= read -r -d '' difficulty; do
+        set_difficulty_style "$difficulty"
+        
+        printf -v block '%b\n%s\n%s\n\n' "$icon ${color}$title${COLOR_RESET}" \
+            "   📋 ID: $id | 🏷️  $category" "   📝 ${description:0:100}..."
+        output+="$block"
+        ((problems_shown++))
+    done < <(printf '%s' "$problems_data" | \
+        jq -j '.[]? | .problem_id, "\u0000", .title, "\u0000", .description, "\u0000",
+                      .category, "\u0000", .difficulty, "\u0000"' 2>/dev/null)
+    
+    printf -v block '%s\n' "📊 Progress: $solved/$total problems solved" "" "💡 Commands:" \
+        "   $SCRIPT_NAME show <id>    - View problem details" \
+        "   $SCRIPT_NAME solve <id>   - Mark as solved" \
+        "   $SCRIPT_NAME generate     - Create new problems"
+    output+="$block"
+    
+    # Emit the challenges and footer in one write
+    printf '%s' "$output"
 }
 
 # Generate new problems
@@ -666,16 +745,19 @@ cmd_generate() {
         # Strict validation: must be non-empty AND valid JSON
         if [[ -n "$problem_json" ]] && echo "$problem_json" | jq -e . >/dev/null 2>&1; then
             local problem_id=$(generate_problem_id)
-            local title=$(echo "$problem_json" | jq -r '.title // "Coding Problem"')
-            local description=$(echo "$problem_json" | jq -r '.description // "Solve this challenge."')
-            local extracted_difficulty=$(echo "$problem_json" | jq -r '.difficulty // "medium"')
-            local category=$(echo "$problem_json" | jq -r '.category // "algorithm"')
-            local test_cases=$(echo "$problem_json" | jq -r '.test_cases // "[]"')
-            local solution=$(echo "$problem_json" | jq -r '.solution // "# Solution"')
+            local title description extracted_difficulty category test_cases solution embedding
+            json_read "$problem_json" \
+                title '.title // "Coding Problem"' \
+                description '.description // "Solve this challenge."' \
+                extracted_difficulty '.difficulty // "medium"' \
+                category '.category // "algorithm"' \
+                test_cases '.test_cases // "[]" | if type == "string" then . else tojson end' \
+                solution '.solution // "# Solution"' \
+                embedding 'if ._embedding then (._embedding | tojson) else "" end'
             
             log_debug "Inserting problem: $title (difficulty: $extracted_difficulty)"
             
-            if insert_problem "$problem_id" "$title" "$description" "$extracted_difficulty" "$category" "$test_cases" "$solution"; then
+            if insert_problem "$problem_id" "$title" "$description" "$extracted_difficulty" "$category" "$test_cases" "$solution" "$embedding"; then
                 echo -e "${COLOR_GREEN}✅${COLOR_RESET}" && ((success_count++))
             else
                 echo -e "${COLOR_RED}❌${COLOR_RESET}"
@@ -703,12 +785,14 @@ cmd_show() {
     
     [[ -z "$problem_data" || "$problem_data" == "[]" ]] && { log_error "Problem not found: $problem_id"; return 1; }
     
-    local title=$(echo "$problem_data" | jq -r '.[0].title')
-    local description=$(echo "$problem_data" | jq -r '.[0].description')
-    local difficulty=$(echo "$problem_data" | jq -r '.[0].difficulty')
-    local category=$(echo "$problem_data" | jq -r '.[0].category')
-    local test_cases=$(echo "$problem_data" | jq -r '.[0].test_cases')
-    local solution=$(echo "$problem_data" | jq -r '.[0].solution')
+    local title description difficulty category test_cases solution
+    json_read "$problem_data" \
+        title '.[0].title' \
+        description '.[0].description' \
+        difficulty '.[0].difficulty' \
+        category '.[0].category' \
+        test_cases '.[0].test_cases' \
+        solution '.[0].solution'
     
     echo && echo -e "${COLOR_BLUE}📝 $title${COLOR_RESET}"
     echo -e "${COLOR_BLUE}════════════════════════════${COLOR_RESET}" && echo
@@ -728,11 +812,14 @@ cmd_solve() {
     local problem_id="$1"
     [[ -z "$problem_id" ]] && { log_error "Problem ID required"; echo "Usage: $SCRIPT_NAME solve <problem-id>"; return 1; }
     
-    local title=$(sql_query "SELECT title FROM problems WHERE problem_id = '$problem_id'" | tail -1 | tr -d ',"' 2>/dev/null)
+    # Update and read the title back in one session; changes() is 0 for unknown IDs
+    local title
+    title=$(sql_exec "UPDATE problems SET is_solved = 1, solved_at = CURRENT_TIMESTAMP WHERE problem_id = '$problem_id';
+        SELECT title FROM problems WHERE problem_id = '$problem_id' AND changes() > 0") || \
+        { log_error "Failed to mark as solved"; return 1; }
     [[ -z "$title" ]] && { log_error "Problem not found: $problem_id"; return 1; }
     
-    sql_exec "UPDATE problems SET is_solved = 1, solved_at = CURRENT_TIMESTAMP WHERE problem_id = '$problem_id'" && \
-        log_success "Solved: $title" || log_error "Failed to mark as solved"
+    log_success "Solved: $title"
 }
 
 # Show problem solution
@@ -764,62 +851,76 @@ cmd_list() {
     
     echo && echo -e "${COLOR_BLUE}📚 Problems ($filter)${COLOR_RESET}" && echo
     
-    local problems=$(sql_query "
+    local problems=$(sqlite3 -json "$DB_FILE" "
         SELECT problem_id, title, difficulty, category, is_solved
         FROM problems $where_clause
-        ORDER BY created_at DESC LIMIT 50")
-    
-    [[ -z "$problems" || $(echo "$problems" | wc -l) -le 1 ]] && { echo "No problems found."; return; }
-    
-    echo "$problems" | tail -n +2 | while IFS=',' read -r id title difficulty category solved; do
-        local status="❌"; [[ "$(echo "$solved" | tr -d '"')" -eq 1 ]] && status="✅"
-        case "$difficulty" in
-            "easy") color="$COLOR_GREEN" ;;
-            "medium") color="$COLOR_YELLOW" ;;
-            "hard") color="$COLOR_RED" ;;
-        esac
-        echo -e "$status ${color}$(echo "$id" | tr -d '"')${COLOR_RESET}: $(echo "$title" | tr -d '"')"
-        echo "      🏷️  $(echo "$category" | tr -d '"') | 🎯 $difficulty"
-    done
+        ORDER BY created_at DESC LIMIT 50" 2>/dev/null)
+    
+    [[ -z "$problems" || "$problems" == "[]" ]] && { echo "No problems found."; return; }
+    
+    # Fields arrive unquoted, so no per-field cleanup is needed
+    local id title difficulty category solved status color icon row rows=""
+    while IFS= read -r -d '' id && IFS= read -r -d '' title && \
+          IFS= read -r -d '' difficulty && IFS= read -r -d '' category && \
+          IFS= read -r -d '' solved; do
+        status="❌"; [[ "$solved" -eq 1 ]] && status="✅"
+        set_difficulty_style "$difficulty"
+        printf -v row '%b\n%s\n' "$status ${color}$id${COLOR_RESET}: $title" "      🏷️  $category | 🎯 $difficulty"
+        rows+="$row"
+    done < <(printf '%s' "$problems" | \
+        jq -j '.[] | .problem_id, "\u0000", .title, "\u0000", .difficulty, "\u0000",
+                     (.category // ""), "\u0000", .is_solved, "\u0000"' 2>/dev/null)
+    
+    # Emit the whole listing in one write
+    printf '%s' "$rows"
 }
 
 # Show progress statistics
 cmd_progress() {
-    echo && echo -e "${COLOR_BLUE}📊 Your Progress${COLOR_RESET}" && echo
-    
-    local total=$(sql_exec "SELECT COUNT(*) FROM problems")
-    local solved=$(sql_exec "SELECT COUNT(*) FROM problems WHERE is_solved = 1")
+    # One grouped query feeds both the overall and the per-difficulty numbers
+    local easy_total=0 easy_solved=0 medium_total=0 medium_solved=0 hard_total=0 hard_solved=0
+    local difficulty count solved_count total=0 solved=0 total_var solved_var
+    while IFS='|' read -r difficulty count solved_count; do
+        case "$difficulty" in
+            "easy"|"medium"|"hard")
+                printf -v "${difficulty}_total" '%s' "$count"
+                printf -v "${difficulty}_solved" '%s' "$solved_count"
+                ;;
+        esac
+        total=$((total + count))
+        solved=$((solved + solved_count))
+    done < <(sql_exec "SELECT difficulty, COUNT(*), COALESCE(SUM(is_solved), 0) FROM problems GROUP BY difficulty")
     
-    echo "✅ Solved: $solved | 📚 Total: $total"
+    # Collect the report and write it in one go
+    local -a lines=("" "${COLOR_BLUE}📊 Your Progress${COLOR_RESET}" "")
+    lines+=("✅ Solved: $solved | 📚 Total: $total")
     
     if [[ "$total" -gt 0 ]]; then
         local percent=$((solved * 100 / total))
-        echo "📈 Completion: $percent%" && echo
+        lines+=("📈 Completion: $percent%" "")
         
-        local bar=""; for ((i=0; i<20; i++)); do
-            [[ $((i * 5)) -lt $percent ]] && bar+="█" || bar+="░"
-        done
-        echo "Progress: [$bar]"
+        # One cell per started 5%, built with two pads instead of a 20-step loop
+        local filled=$(( (percent + 4) / 5 )) bar_fill bar_empty
+        (( filled > 20 )) && filled=20
+        printf -v bar_fill '%*s' "$filled" ''
+        printf -v bar_empty '%*s' $((20 - filled)) ''
+        lines+=("Progress: [${bar_fill// /█}${bar_empty// /░}]")
     fi
     
-    echo && echo -e "${COLOR_CYAN}By Difficulty:${COLOR_RESET}"
+    lines+=("" "${COLOR_CYAN}By Difficulty:${COLOR_RESET}")
     for difficulty in "easy" "medium" "hard"; do
-        local stats=$(sql_query "SELECT COUNT(*), SUM(is_solved) FROM problems WHERE difficulty = '$difficulty'" | tail -1)
-        IFS=',' read -r total solved <<< "$stats"
-        total=$(echo "$total" | tr -d '"' | tr -d '[:space:]'); total=${total:-0}
-        solved=$(echo "$solved" | tr -d '"' | tr -d '[:space:]'); solved=${solved:-0}
+        total_var="${difficulty}_total"; solved_var="${difficulty}_solved"
+        total=${!total_var}; solved=${!solved_var}
         
-        case "$difficulty" in
-            "easy") color="$COLOR_GREEN"; icon="🟢" ;;
-            "medium") color="$COLOR_YELLOW"; icon="🟡" ;;
-            "hard") color="$COLOR_RED"; icon="🔴" ;;
-        esac
+        set_difficulty_style "$difficulty"
         
         local percent=0; [[ $total -gt 0 ]] && percent=$((solved * 100 / total))
-        echo -e "  $icon $color$difficulty${COLOR_RESET}: $solved/$total ($percent%)"
+        lines+=("  $icon $color$difficulty${COLOR_RESET}: $solved/$total ($percent%)")
     done
+    lines+=("")
     
-    echo && check_vector_db_health
+    printf '%b\n' "${lines[@]}"
+    check_vector_db_health
 }
 
 # Vector management commands
@@ -835,7 +936,7 @@ cmd_vectors() {
     fi
     
     local total=$(sql_exec "SELECT COUNT(*) FROM problems")
-    local existing=$(curl -s "${QDRANT_URL}/collections/${QDRANT_COLLECTION}" | jq -r '.result.vectors_count // 0')
+    local existing=$(curl -s "${QDRANT_COLLECTION_URL}" | jq -r '.result.vectors_count // 0')
     local missing=$((total - existing))
     
     if [[ $missing -eq 0 ]]; then
@@ -850,14 +951,10 @@ cmd_vectors() {
         SELECT problem_id, title, description 
         FROM problems" 2>/dev/null)
     
-    local count=0
-    local total_to_process=$(echo "$problems_json" | jq length)
-    
-    echo "$problems_json" | jq -c '.[]' | while IFS= read -r problem; do
-        local id=$(echo "$problem" | jq -r '.problem_id')
-        local title=$(echo "$problem" | jq -r '.title')
-        local description=$(echo "$problem" | jq -r '.description')
-        
+    # Stream every row out of a single jq process
+    local count=0 id title description
+    while IFS= read -r -d '' id && IFS= read -r -d '' title && \
+          IFS= read -r -d '' description; do
         # Skip if empty or invalid
         if [[ -z "$id" || "$id" == "null" ]]; then
             continue
@@ -871,7 +968,8 @@ cmd_vectors() {
             echo -e "${COLOR_RED}❌${COLOR_RESET}"
         fi
         sleep 1
-    done
+    done < <(printf '%s' "$problems_json" | \
+        jq -j '.[]? | (.problem_id // ""), "\u0000", .title, "\u0000", .description, "\u0000"' 2>/dev/null)
     
     log_success "Synced embeddings for $count problems to Qdrant"
     ;;
@@ -894,7 +992,7 @@ cmd_vectors() {
     local numeric_id=$(echo -n "$problem_id" | cksum | cut -d' ' -f1)
     
     # Get the problem's embedding from Qdrant first
-    local point_data=$(curl -s "${QDRANT_URL}/collections/${QDRANT_COLLECTION}/points/$numeric_id")
+    local point_data=$(curl -s "${QDRANT_COLLECTION_URL}/points/$numeric_id")
     local vector=$(echo "$point_data" | jq -r '.result.vector // empty')
     
     if [[ -z "$vector" ]]; then
@@ -903,7 +1001,7 @@ cmd_vectors() {
     fi
     
     local similar=$(curl -s -X POST \
-        "${QDRANT_URL}/collections/${QDRANT_COLLECTION}/points/search" \
+        "${QDRANT_COLLECTION_URL}/points/search" \
         -H "Content-Type: application/json" \
         -d "{
             \"vector\": $vector,
@@ -984,12 +1082,49 @@ cmd_vectors() {
 # MAIN FUNCTION
 # =============================================================================
 
+# Help text, expanded once at load time and written with a single printf
+readonly HELP_TEXT="
+${COLOR_BLUE}CodeQuest - Daily Coding Problems with AI & Vector Similarity${COLOR_RESET}
+
+Usage: $SCRIPT_NAME [COMMAND]
+
+Commands:
+  today              Show today's problems (default)
+  generate           Create 3 new problems (easy, medium, hard)
+  show <id>          View problem details
+  solve <id>         Mark problem as solved
+  solution <id>      Show solution
+  list [solved|unsolved|all] List problems
+  progress           Show learning stats
+  vectors <cmd>      Manage Qdrant vector embeddings
+  help               Show this help
+
+Vector Commands:
+  vectors sync       Generate missing embeddings in Qdrant
+  vectors stats      Show Qdrant database health
+  vectors similar <id> Find similar problems
+  vectors migrate    Migrate from SQLite-vvec to Qdrant
+
+Examples:
+  $SCRIPT_NAME                    # Show today's challenges
+  $SCRIPT_NAME generate           # Create 3 new problems
+  $SCRIPT_NAME show CQ-123456    # View specific problem
+  $SCRIPT_NAME solve CQ-123456   # Mark as solved
+  $SCRIPT_NAME vectors migrate   # Migrate to Qdrant
+"
+
 main() {
     local command="${1:-today}" arg1="${2:-}"
     
-    check_dependencies || return 1
-    ensure_directories
-    init_database
+    # Help needs neither the database nor Qdrant, so only set up for real commands
+    case "$command" in
+        "help"|"--help"|"-h") ;;
+        *)
+            check_dependencies || return 1
+            ensure_directories
+            init_database
+            ;;
+    esac
     
     case "$command" in
         "today")          cmd_today ;;
@@ -1001,29 +1136,7 @@ main() {
         "progress"|"stats") cmd_progress ;;
         "vectors")        cmd_vectors "$arg1" ;;
         "help"|"--help"|"-h")
-            echo && echo -e "${COLOR_BLUE}CodeQuest - Daily Coding Problems with AI & Vector Similarity${COLOR_RESET}" && echo
-            echo "Usage: $SCRIPT_NAME [COMMAND]"
-            echo && echo "Commands:"
-            echo "  today              Show today's problems (default)"
-            echo "  generate           Create 3 new problems (easy, medium, hard)"
-            echo "  show <id>          View problem details"
-            echo "  solve <id>         Mark problem as solved"
-            echo "  solution <id>      Show solution"
-            echo "  list [solved|unsolved|all] List problems"
-            echo "  progress           Show learning stats"
-            echo "  vectors <cmd>      Manage Qdrant vector embeddings"
-            echo "  help               Show this help"
-            echo && echo "Vector Commands:"
-            echo "  vectors sync       Generate missing embeddings in Qdrant"
-            echo "  vectors stats      Show Qdrant database health"
-            echo "  vectors similar <id> Find similar problems"
-            echo "  vectors migrate    Migrate from SQLite-vvec to Qdrant"
-            echo && echo "Examples:"
-            echo "  $SCRIPT_NAME                    # Show today's challenges"
-            echo "  $SCRIPT_NAME generate           # Create 3 new problems"
-            echo "  $SCRIPT_NAME show CQ-123456    # View specific problem"
-            echo "  $SCRIPT_NAME solve CQ-123456   # Mark as solved"
-            echo "  $SCRIPT_NAME vectors migrate   # Migrate to Qdrant"
+            printf '%b' "$HELP_TEXT"
             ;;
         *) log_error "Unknown command: $command"; echo "Use '$SCRIPT_NAME help' for available commands"; return 1 ;;
     esac